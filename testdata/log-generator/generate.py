@@ -9,13 +9,19 @@ for testing the OpenSearch Query Receiver.
 import os
 import sys
 import time
+import gzip
+import base64
 import random
-import json
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Tuple
+import aiohttp
+import numpy as np
+import orjson
 import requests
-from requests.auth import HTTPBasicAuth
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(
@@ -31,24 +37,69 @@ OPENSEARCH_PASSWORD = os.getenv('OPENSEARCH_PASSWORD', 'admin')
 GENERATION_INTERVAL = int(os.getenv('GENERATION_INTERVAL', '10'))  # seconds
 LOGS_PER_BATCH = int(os.getenv('LOGS_PER_BATCH', '50'))
 
+# Split oversized batches into separate _bulk requests so a large
+# LOGS_PER_BATCH cannot produce a payload the cluster rejects
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '500'))
+
+# Number of concurrent _bulk requests in flight
+INDEX_CONCURRENCY = int(os.getenv('INDEX_CONCURRENCY', '2'))
+
+# Retries per _bulk chunk on 429/5xx responses, doubling from the
+# initial backoff (mirrors opensearchpy helpers.bulk defaults)
+BULK_MAX_RETRIES = 3
+BULK_INITIAL_BACKOFF = 2.0  # seconds
+
 # Disable SSL warnings for self-signed certificates
 requests.packages.urllib3.disable_warnings()
 
-# Sample data for log generation
-LOG_LEVELS = ['DEBUG', 'INFO', 'WARN', 'ERROR', 'CRITICAL']
-LOG_LEVEL_WEIGHTS = [5, 60, 20, 10, 5]  # Probability weights
+# Basic auth header computed once instead of re-encoding the credentials
+# on every request
+_AUTH_HEADER = 'Basic ' + base64.b64encode(
+    f"{OPENSEARCH_USERNAME}:{OPENSEARCH_PASSWORD}".encode()).decode()
+
+# Shared session so bulk batches reuse pooled connections instead of
+# paying a TCP+TLS handshake per request
+SESSION = requests.Session()
+SESSION.headers['Authorization'] = _AUTH_HEADER
+SESSION.verify = False
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    # allowed_methods=None retries every method; Retry's default set
+    # excludes POST, which would silently skip the status_forcelist
+    max_retries=Retry(total=3, backoff_factor=0.5,
+                      status_forcelist=[429, 502, 503, 504],
+                      allowed_methods=None)
+)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+# Sample data for log generation; tuples throughout, and the hot path
+# works in level/service/environment ordinals so per-entry lookups are
+# tuple indexing instead of dict hashing
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARN', 'ERROR', 'CRITICAL')
+LOG_LEVEL_WEIGHTS = (5, 60, 20, 10, 5)  # Probability weights
+LOG_LEVEL_P = np.array(LOG_LEVEL_WEIGHTS) / sum(LOG_LEVEL_WEIGHTS)
+
+# Vectorized generator: one C-level draw per field per batch instead of
+# several interpreted random calls per entry
+RNG = np.random.default_rng()
+
+SERVICES = ('api-gateway', 'auth-service', 'payment-service', 'user-service', 'notification-service')
+ENVIRONMENTS = ('development', 'staging', 'production')
 
-SERVICES = ['api-gateway', 'auth-service', 'payment-service', 'user-service', 'notification-service']
-ENVIRONMENTS = ['development', 'staging', 'production']
+# Service ordinals the entry generator branches on
+_PAYMENT_SERVICE = SERVICES.index('payment-service')
+_API_GATEWAY = SERVICES.index('api-gateway')
 
 MESSAGES = {
-    'DEBUG': [
+    'DEBUG': (
         'Debug information logged',
         'Variable value: {}',
         'Function entry point',
         'Processing request',
-    ],
-    'INFO': [
+    ),
+    'INFO': (
         'Request processed successfully',
         'User login successful',
         'Transaction completed',
@@ -56,16 +107,16 @@ MESSAGES = {
         'Configuration loaded',
         'Service started',
         'Health check passed',
-    ],
-    'WARN': [
+    ),
+    'WARN': (
         'High memory usage detected',
         'Slow query detected',
         'Rate limit approaching',
         'Deprecated API used',
         'Connection pool exhausted',
         'Retry attempt {}',
-    ],
-    'ERROR': [
+    ),
+    'ERROR': (
         'Database connection failed',
         'Authentication failed',
         'Invalid request parameters',
@@ -73,21 +124,46 @@ MESSAGES = {
         'Payment processing failed',
         'API endpoint not found',
         'Validation error',
-    ],
-    'CRITICAL': [
+    ),
+    'CRITICAL': (
         'Database unavailable',
         'Service crashed',
         'Critical security breach detected',
         'Disk space exhausted',
         'Memory allocation failed',
-    ]
+    )
 }
 
 ERROR_CODES = {
-    'ERROR': ['ERR_001', 'ERR_002', 'ERR_003', 'ERR_404', 'ERR_500', 'ERR_503'],
-    'CRITICAL': ['CRIT_001', 'CRIT_002', 'CRIT_DB_DOWN', 'CRIT_MEM', 'CRIT_DISK']
+    'ERROR': ('ERR_001', 'ERR_002', 'ERR_003', 'ERR_404', 'ERR_500', 'ERR_503'),
+    'CRITICAL': ('CRIT_001', 'CRIT_002', 'CRIT_DB_DOWN', 'CRIT_MEM', 'CRIT_DISK')
 }
 
+# Level-ordinal views of the above; None where a level has no error codes
+MESSAGES_BY_IDX = tuple(MESSAGES[level] for level in LOG_LEVELS)
+ERROR_CODES_BY_IDX = tuple(ERROR_CODES.get(level) for level in LOG_LEVELS)
+
+STATUS_CODES_INFO = (200, 201, 204)
+STATUS_CODES_WARN = (400, 401, 403, 429)
+STATUS_CODES_ERROR = (500, 502, 503, 504)
+SEVERITIES = ('low', 'medium', 'high', 'critical')
+TRANSACTION_TYPES = ('payment', 'refund', 'chargeback')
+API_ENDPOINTS = ('/api/v1/users', '/api/v1/products', '/api/v1/orders', '/api/v1/payments')
+
+# Fields drawn from small closed sets, pre-serialized per combination with
+# the trailing '}' sliced off so the per-entry dynamic fields can be
+# appended at the bytes level; indexed [level][service][environment]
+_STATIC_PREFIX = tuple(
+    tuple(
+        tuple(
+            orjson.dumps({'level': level, 'service': service, 'environment': env})[:-1]
+            for env in ENVIRONMENTS
+        )
+        for service in SERVICES
+    )
+    for level in LOG_LEVELS
+)
+
 def create_index_template():
     """
     Create an index template for logs
@@ -122,14 +198,11 @@ def create_index_template():
     }
 
     url = f"{OPENSEARCH_ENDPOINT}/_index_template/logs-template"
-    auth = HTTPBasicAuth(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD)
 
     try:
-        response = requests.put(
+        response = SESSION.put(
             url,
             json=template,
-            auth=auth,
-            verify=False,
             timeout=10
         )
         if response.status_code in [200, 201]:
@@ -142,148 +215,251 @@ def create_index_template():
         logger.error(f"Error creating index template: {e}")
         return False
 
-def generate_log_entry() -> Dict[str, Any]:
+def generate_batch(n: int) -> List[bytes]:
     """
-    Generate a single synthetic log entry
+    Generate a batch of synthetic log entries, serialized as JSON bytes
+
+    Draws the random selections for the whole batch as vectorized NumPy
+    arrays, so the per-entry work is reduced to indexed lookups and dict
+    construction.
     """
-    level = random.choices(LOG_LEVELS, weights=LOG_LEVEL_WEIGHTS)[0]
-    service = random.choice(SERVICES)
-    environment = random.choice(ENVIRONMENTS)
+    # .tolist() converts each array to native Python types in one pass,
+    # keeping the entries directly serializable by orjson. Categorical
+    # draws are ordinals into the module-level tuples.
+    levels = RNG.choice(len(LOG_LEVELS), size=n, p=LOG_LEVEL_P).tolist()
+    services = RNG.integers(0, len(SERVICES), size=n).tolist()
+    environments = RNG.integers(0, len(ENVIRONMENTS), size=n).tolist()
+    host_suffixes = RNG.integers(1, 6, size=n).tolist()
+    # One uniform draw per entry gates all the probabilistic fields
+    gates = RNG.random(n).tolist()
+    user_ids = RNG.integers(1000, 10000, size=n).tolist()
+    request_ids = RNG.integers(100000, 1000000, size=n).tolist()
+    response_times = RNG.integers(10, 5001, size=n).tolist()
+
+    # Sibling entries are generated within microseconds of each other, so
+    # one timestamp per batch is precise enough for synthetic data
+    ts = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+    return [
+        generate_log_entry(
+            ts, levels[i], services[i], environments[i], host_suffixes[i],
+            gates[i], user_ids[i], request_ids[i], response_times[i]
+        )
+        for i in range(n)
+    ]
 
-    # Base log entry
+def generate_log_entry(ts: str, level: int, service: int, environment: int,
+                       host_suffix: int, gate: float, user_id: int,
+                       request_id: int, response_time: int) -> bytes:
+    """
+    Generate a single synthetic log entry from pre-drawn random values,
+    serialized as JSON bytes
+
+    level, service, and environment are ordinals into LOG_LEVELS,
+    SERVICES, and ENVIRONMENTS. gate is a single uniform draw shared by
+    the probabilistic fields via threshold ranges, so no entry needs
+    another random.random() call.
+    """
+    # Dynamic fields; level/service/environment come from the
+    # pre-serialized prefix table
     log = {
-        '@timestamp': datetime.utcnow().isoformat() + 'Z',
-        'level': level,
-        'message': random.choice(MESSAGES[level]),
-        'service': service,
-        'environment': environment,
-        'host': f"{service}-{random.randint(1, 5)}",
+        '@timestamp': ts,
+        'message': random.choice(MESSAGES_BY_IDX[level]),
+        'host': f"{SERVICES[service]}-{host_suffix}",
     }
 
     # Add user_id for some logs (simulating authenticated requests)
-    if random.random() > 0.3:
-        log['user_id'] = f"user_{random.randint(1000, 9999)}"
+    if gate < 0.7:
+        log['user_id'] = f"user_{user_id}"
 
     # Add request_id for all logs
-    log['request_id'] = f"req_{random.randint(100000, 999999)}"
+    log['request_id'] = f"req_{request_id}"
 
     # Add response time for INFO and above
-    if level in ['INFO', 'WARN', 'ERROR', 'CRITICAL']:
-        log['response_time_ms'] = random.randint(10, 5000)
-
-    # Add status code for some logs
-    if level in ['INFO', 'WARN', 'ERROR']:
-        if level == 'INFO':
-            log['status_code'] = random.choice([200, 201, 204])
-        elif level == 'WARN':
-            log['status_code'] = random.choice([400, 401, 403, 429])
-        else:  # ERROR
-            log['status_code'] = random.choice([500, 502, 503, 504])
-
-    # Add error code for errors
-    if level in ERROR_CODES:
-        log['error_code'] = random.choice(ERROR_CODES[level])
-
-    # Add severity for errors
-    if level in ['ERROR', 'CRITICAL']:
-        log['severity'] = random.choice(['low', 'medium', 'high', 'critical'])
+    if level >= 1:
+        log['response_time_ms'] = response_time
+
+    # Add status code for INFO/WARN/ERROR
+    if level == 1:
+        log['status_code'] = random.choice(STATUS_CODES_INFO)
+    elif level == 2:
+        log['status_code'] = random.choice(STATUS_CODES_WARN)
+    elif level == 3:
+        log['status_code'] = random.choice(STATUS_CODES_ERROR)
+
+    # Add error code and severity for errors
+    error_codes = ERROR_CODES_BY_IDX[level]
+    if error_codes is not None:
+        log['error_code'] = random.choice(error_codes)
+        log['severity'] = random.choice(SEVERITIES)
 
     # Add transaction type for payment service
-    if service == 'payment-service' and random.random() > 0.5:
-        log['transaction_type'] = random.choice(['payment', 'refund', 'chargeback'])
-        if level == 'ERROR':
-            log['status'] = 'failed'
-        else:
-            log['status'] = 'success'
+    if service == _PAYMENT_SERVICE and gate >= 0.5:
+        log['transaction_type'] = random.choice(TRANSACTION_TYPES)
+        log['status'] = 'failed' if level == 3 else 'success'
 
     # Add path for API logs
-    if service == 'api-gateway':
-        endpoints = ['/api/v1/users', '/api/v1/products', '/api/v1/orders', '/api/v1/payments']
-        log['path'] = random.choice(endpoints)
-
-    return log
+    if service == _API_GATEWAY:
+        log['path'] = random.choice(API_ENDPOINTS)
+
+    # Splice the serialized objects together at the bytes level: the
+    # prefix already lacks its closing brace, the dynamic part drops its
+    # opening one
+    return _STATIC_PREFIX[level][service][environment] + b',' + orjson.dumps(log)[1:]
+
+# Daily index name, recomputed only when the UTC day rolls over
+_CACHED_DAY = None
+_CACHED_INDEX = None
+
+# Reusable NDJSON buffer; cleared between chunks so its backing
+# allocation survives across batches instead of being rebuilt each time
+_BULK_BUF = bytearray()
+
+def _current_index() -> str:
+    global _CACHED_DAY, _CACHED_INDEX
+    day = datetime.utcnow().strftime('%Y.%m.%d')
+    if day != _CACHED_DAY:
+        _CACHED_DAY = day
+        _CACHED_INDEX = f"logs-{day}"
+    return _CACHED_INDEX
+
+def build_bulk_chunks(logs: List[bytes]) -> List[Tuple[int, bytes]]:
+    """
+    Serialize a batch into gzipped _bulk chunk bodies
 
-def index_logs(logs: List[Dict[str, Any]]) -> bool:
+    Returns (document count, compressed body) pairs, splitting large
+    batches so a large LOGS_PER_BATCH cannot produce a payload the
+    cluster rejects.
     """
-    Bulk index logs into OpenSearch
+    # The index action is identical for every document, so serialize it
+    # once instead of per entry
+    action = orjson.dumps({"index": {"_index": _current_index()}})
+
+    # Local alias: augmented assignment on the module-level name would
+    # make it local to this function
+    buf = _BULK_BUF
+    chunks = []
+    for start in range(0, len(logs), BULK_CHUNK_SIZE):
+        chunk = logs[start:start + BULK_CHUNK_SIZE]
+
+        # Build the chunk's bulk request in the reused buffer; entries are
+        # already serialized
+        buf.clear()
+        for doc in chunk:
+            buf += action
+            buf += b'\n'
+            buf += doc
+            buf += b'\n'
+
+        # NDJSON keys repeat on every document, so even the fastest gzip
+        # level shrinks the payload several-fold
+        chunks.append((len(chunk), gzip.compress(buf, compresslevel=1)))
+
+    return chunks
+
+async def index_worker(session: aiohttp.ClientSession, queue: asyncio.Queue):
     """
-    # Create today's index name
-    index_name = f"logs-{datetime.utcnow().strftime('%Y.%m.%d')}"
-
-    # Build bulk request
-    bulk_data = []
-    for log in logs:
-        # Index action
-        bulk_data.append(json.dumps({"index": {"_index": index_name}}))
-        # Document
-        bulk_data.append(json.dumps(log))
-
-    bulk_body = '\n'.join(bulk_data) + '\n'
+    Consume gzipped _bulk bodies from the queue and POST them to OpenSearch
 
+    429 and 5xx responses are retried up to BULK_MAX_RETRIES times with
+    doubling backoff before the chunk is dropped.
+    """
     url = f"{OPENSEARCH_ENDPOINT}/_bulk"
-    auth = HTTPBasicAuth(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD)
-
-    try:
-        response = requests.post(
-            url,
-            data=bulk_body,
-            headers={'Content-Type': 'application/x-ndjson'},
-            auth=auth,
-            verify=False,
-            timeout=10
-        )
+    headers = {'Content-Type': 'application/x-ndjson',
+               'Content-Encoding': 'gzip',
+               'Authorization': _AUTH_HEADER}
 
-        if response.status_code == 200:
-            result = response.json()
-            if result.get('errors'):
-                logger.error("Some documents failed to index")
-                return False
-            logger.info(f"Indexed {len(logs)} log entries to {index_name}")
-            return True
-        else:
-            logger.error(f"Bulk index failed: {response.status_code} - {response.text}")
-            return False
-
-    except Exception as e:
-        logger.error(f"Error indexing logs: {e}")
-        return False
+    while True:
+        count, body = await queue.get()
+        try:
+            delay = BULK_INITIAL_BACKOFF
+            for attempt in range(BULK_MAX_RETRIES + 1):
+                async with session.post(url, data=body, headers=headers) as response:
+                    status = response.status
+                    if status == 200:
+                        # Only the top-level errors flag matters here; parse the
+                        # raw body with orjson instead of aiohttp's json() (which
+                        # goes through stdlib json and charset detection)
+                        if orjson.loads(await response.read()).get('errors'):
+                            logger.error("Some documents failed to index")
+                        else:
+                            logger.info(f"Indexed {count} log entries to {_current_index()}")
+                        break
+
+                    retryable = status == 429 or status >= 500
+                    if not retryable or attempt >= BULK_MAX_RETRIES:
+                        text = await response.text()
+                        logger.error(f"Bulk index failed: {status} - {text}")
+                        break
+                    logger.warning(f"Bulk index got {status}, retrying in {delay:.0f}s")
+
+                await asyncio.sleep(delay)
+                delay *= 2
+        except Exception as e:
+            logger.error(f"Error indexing logs: {e}")
+        finally:
+            queue.task_done()
 
 def wait_for_opensearch():
     """
     Wait for OpenSearch to be ready
-    """
-    url = f"{OPENSEARCH_ENDPOINT}/_cluster/health"
-    auth = HTTPBasicAuth(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD)
 
+    Probes the HTTP listener with cheap HEAD requests under exponential
+    backoff plus jitter (0.5s growing to 10s, 300s deadline) — full
+    cluster-health calls make the node walk its indices and shards, which
+    is wasted work while it is still booting. Once the listener answers,
+    a single health call with the server-side wait_for_status parameter
+    blocks until the cluster reaches yellow instead of polling for it.
+    """
     logger.info("Waiting for OpenSearch to be ready...")
-    max_retries = 30
-    retry_interval = 10
+    deadline = time.monotonic() + 300
+    delay = 0.5
 
-    for i in range(max_retries):
+    while time.monotonic() < deadline:
         try:
-            response = requests.get(url, auth=auth, verify=False, timeout=5)
-            if response.status_code == 200:
-                logger.info("OpenSearch is ready!")
-                return True
+            # Any HTTP answer (including 401) means the listener is up
+            SESSION.head(f"{OPENSEARCH_ENDPOINT}/", timeout=2)
+            break
         except Exception as e:
-            logger.debug(f"OpenSearch not ready yet: {e}")
+            logger.debug(f"OpenSearch not listening yet: {e}")
 
-        if i < max_retries - 1:
-            logger.info(f"Retrying in {retry_interval} seconds... ({i+1}/{max_retries})")
-            time.sleep(retry_interval)
+        time.sleep(delay + random.uniform(0, delay * 0.2))
+        delay = min(delay * 1.5, 10.0)
+    else:
+        logger.error("OpenSearch did not become ready in time")
+        return False
+
+    try:
+        response = SESSION.get(
+            f"{OPENSEARCH_ENDPOINT}/_cluster/health",
+            params={'wait_for_status': 'yellow', 'timeout': '30s'},
+            timeout=35
+        )
+        response.raise_for_status()
+        if response.json().get('status') != 'red':
+            logger.info("OpenSearch is ready!")
+            return True
+        logger.error("Cluster health is still red")
+    except Exception as e:
+        logger.error(f"Cluster health check failed: {e}")
 
-    logger.error("OpenSearch did not become ready in time")
     return False
 
-def main():
+async def main():
     """
     Main log generation loop
+
+    Batches are generated by the producer loop and indexed by concurrent
+    worker tasks, so the next batch is built while previous ones are
+    still in flight.
     """
     logger.info("Starting log generator")
     logger.info(f"OpenSearch endpoint: {OPENSEARCH_ENDPOINT}")
     logger.info(f"Generation interval: {GENERATION_INTERVAL}s")
     logger.info(f"Logs per batch: {LOGS_PER_BATCH}")
 
+    # Startup is sequential, so the blocking helpers are fine here
+
     # Wait for OpenSearch
     if not wait_for_opensearch():
         sys.exit(1)
@@ -295,27 +471,40 @@ def main():
     # Generate logs continuously
     logger.info("Starting log generation loop")
     batch_count = 0
+    queue = asyncio.Queue(maxsize=4)
 
-    try:
-        while True:
-            # Generate batch of logs
-            logs = [generate_log_entry() for _ in range(LOGS_PER_BATCH)]
+    connector = aiohttp.TCPConnector(ssl=False, limit=8)
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=timeout) as session:
+        workers = [
+            asyncio.create_task(index_worker(session, queue))
+            for _ in range(INDEX_CONCURRENCY)
+        ]
+
+        try:
+            while True:
+                # Generate batch of logs and hand the chunks to the workers
+                logs = generate_batch(LOGS_PER_BATCH)
+                for chunk in build_bulk_chunks(logs):
+                    await queue.put(chunk)
 
-            # Index logs
-            if index_logs(logs):
                 batch_count += 1
                 logger.info(f"Generated batch #{batch_count} ({len(logs)} logs)")
-            else:
-                logger.error("Failed to index logs")
 
-            # Wait before next batch
-            time.sleep(GENERATION_INTERVAL)
+                # Wait before next batch
+                await asyncio.sleep(GENERATION_INTERVAL)
+        finally:
+            await queue.join()
+            for worker in workers:
+                worker.cancel()
 
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Stopping log generator")
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         sys.exit(1)
-
-if __name__ == '__main__':
-    main()
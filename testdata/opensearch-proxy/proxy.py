@@ -11,14 +11,22 @@ This proxy:
 2. Adds authentication credentials to requests
 3. Forwards requests to OpenSearch
 4. Returns OpenSearch responses to the client
+
+It runs as an async Starlette app under Uvicorn so concurrent requests
+overlap their I/O waits on OpenSearch instead of serializing on one thread.
 """
 
 import os
-import requests
+import base64
 import logging
-from flask import Flask, request, Response
-from urllib.parse import urljoin
-from requests.auth import HTTPBasicAuth
+import itertools
+from contextlib import asynccontextmanager
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
 
 # Configure logging
 logging.basicConfig(
@@ -27,98 +35,126 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Flask app
-app = Flask(__name__)
-
 # Configuration from environment variables
 OPENSEARCH_ENDPOINT = os.getenv('OPENSEARCH_ENDPOINT', 'https://localhost:9200')
 OPENSEARCH_USERNAME = os.getenv('OPENSEARCH_USERNAME', 'admin')
 OPENSEARCH_PASSWORD = os.getenv('OPENSEARCH_PASSWORD', 'admin')
 
-# Disable SSL warnings for self-signed certificates (dev only)
-requests.packages.urllib3.disable_warnings()
+# Hop-by-hop headers stripped from proxied requests and responses; built
+# once so the hot path does O(1) frozenset lookups per header. The client's
+# authorization header is dropped so the proxy's own credentials apply.
+_EXCLUDED_REQ_HEADERS = frozenset({'host', 'connection', 'transfer-encoding', 'content-length', 'authorization'})
+_EXCLUDED_RESP_HEADERS = frozenset({'connection', 'keep-alive', 'transfer-encoding', 'content-encoding', 'content-length'})
+
+# Per-request logging is DEBUG-only; at INFO, emit one sampled line every
+# _LOG_SAMPLE_EVERY requests so progress stays visible without the
+# formatting, lock, and write cost on every request
+_REQ_COUNT = itertools.count()
+_LOG_SAMPLE_EVERY = 1000
+
+# Basic auth header computed once instead of re-encoding the credentials
+# on every proxied request
+_AUTH_HEADER = 'Basic ' + base64.b64encode(
+    f"{OPENSEARCH_USERNAME}:{OPENSEARCH_PASSWORD}".encode()).decode()
+
+# Shared async client; connections to OpenSearch are pooled and kept alive
+# across proxied requests, and HTTP/2 lets concurrent in-flight requests
+# multiplex over one TLS stream when the cluster supports it (httpx falls
+# back to HTTP/1.1 via ALPN otherwise). SSL verification stays off for the
+# self-signed dev certificates.
+client = httpx.AsyncClient(
+    base_url=OPENSEARCH_ENDPOINT,
+    headers={'Authorization': _AUTH_HEADER},
+    verify=False,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    timeout=30.0
+)
 
-@app.route('/', defaults={'path': ''}, methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS'])
-@app.route('/<path:path>', methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS'])
-def proxy(path):
+async def proxy(request):
     """
     Proxy all requests to OpenSearch with authentication
     """
-    # Build the target URL
-    url = urljoin(OPENSEARCH_ENDPOINT + '/', path)
-    if request.query_string:
-        url = f"{url}?{request.query_string.decode('utf-8')}"
-
-    logger.info(f"Proxying {request.method} request to {url}")
+    path = '/' + request.path_params['path']
+    # Forward the raw query string verbatim; feeding QueryParams to httpx
+    # as a mapping would collapse repeated parameters (?h=index&h=status)
+    # to their last value
+    if request.url.query:
+        path = f"{path}?{request.url.query}"
+
+    count = next(_REQ_COUNT)
+    if count % _LOG_SAMPLE_EVERY == 0:
+        logger.info("Proxied %d requests (current: %s %s)", count, request.method, path)
+    logger.debug("Proxying %s request to %s", request.method, path)
 
     # Prepare headers (exclude hop-by-hop headers)
     headers = {
         key: value for key, value in request.headers.items()
-        if key.lower() not in ['host', 'connection', 'transfer-encoding']
+        if key.lower() not in _EXCLUDED_REQ_HEADERS
     }
 
-    # Add authentication
-    auth = HTTPBasicAuth(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD)
-
     try:
         # Forward the request to OpenSearch
-        response = requests.request(
+        upstream = client.build_request(
             method=request.method,
-            url=url,
+            url=path,
             headers=headers,
-            data=request.get_data(),
-            auth=auth,
-            verify=False,  # Disable SSL verification (dev only)
-            allow_redirects=False,
-            timeout=30
+            content=await request.body()
         )
+        response = await client.send(upstream, stream=True)
 
-        # Build response
-        excluded_headers = ['connection', 'keep-alive', 'transfer-encoding', 'content-encoding']
-        response_headers = [
-            (name, value) for name, value in response.headers.items()
-            if name.lower() not in excluded_headers
-        ]
+    except httpx.HTTPError as e:
+        logger.error(f"Error proxying request: {e}")
+        return PlainTextResponse(f"Proxy error: {str(e)}", status_code=502)
 
-        logger.info(f"OpenSearch responded with status {response.status_code}")
+    # Build response
+    response_headers = {
+        name: value for name, value in response.headers.items()
+        if name.lower() not in _EXCLUDED_RESP_HEADERS
+    }
 
-        return Response(
-            response.content,
-            status=response.status_code,
-            headers=response_headers
-        )
+    logger.debug("OpenSearch responded with status %s", response.status_code)
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error proxying request: {e}")
-        return Response(
-            f"Proxy error: {str(e)}",
-            status=502
-        )
+    # Stream the (decoded) body through without buffering it in the proxy
+    return StreamingResponse(
+        response.aiter_bytes(),
+        status_code=response.status_code,
+        headers=response_headers,
+        background=BackgroundTask(response.aclose)
+    )
 
-@app.route('/health', methods=['GET'])
-def health():
+async def health(request):
     """
     Health check endpoint
     """
     try:
         # Check OpenSearch health
-        response = requests.get(
-            f"{OPENSEARCH_ENDPOINT}/_cluster/health",
-            auth=HTTPBasicAuth(OPENSEARCH_USERNAME, OPENSEARCH_PASSWORD),
-            verify=False,
-            timeout=5
-        )
+        response = await client.get('/_cluster/health', timeout=5.0)
 
         if response.status_code == 200:
-            return {'status': 'healthy', 'opensearch': 'connected'}, 200
+            return JSONResponse({'status': 'healthy', 'opensearch': 'connected'}, status_code=200)
         else:
-            return {'status': 'unhealthy', 'opensearch': 'unreachable'}, 503
+            return JSONResponse({'status': 'unhealthy', 'opensearch': 'unreachable'}, status_code=503)
 
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return {'status': 'unhealthy', 'error': str(e)}, 503
+        return JSONResponse({'status': 'unhealthy', 'error': str(e)}, status_code=503)
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await client.aclose()
+
+app = Starlette(
+    routes=[
+        Route('/health', health, methods=['GET']),
+        Route('/{path:path}', proxy,
+              methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']),
+    ],
+    lifespan=lifespan
+)
 
 if __name__ == '__main__':
     logger.info(f"Starting OAuth2 proxy for OpenSearch at {OPENSEARCH_ENDPOINT}")
     logger.info("Proxy listening on http://0.0.0.0:8080")
-    app.run(host='0.0.0.0', port=8080, debug=False)
+    uvicorn.run(app, host='0.0.0.0', port=8080)